@@ -0,0 +1,22 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.24;
+
+import "forge-std/Script.sol";
+import "forge-std/console.sol";
+import {Factory} from "../src/factory/Factory.sol";
+
+contract DeployFactory is Script {
+    // Required envs:
+    // - FACTORY_ADMIN (address)  // must be the Phase-2 broadcaster to call deploySpoke
+
+    function run() external {
+        address admin = vm.envAddress("FACTORY_ADMIN");
+        require(admin != address(0), "FACTORY_ADMIN required");
+
+        vm.startBroadcast();
+        Factory f = new Factory();
+        f.initialize(admin);
+        console.log("Factory deployed: %s", address(f));
+        vm.stopBroadcast();
+    }
+}
@@ -0,0 +1,378 @@
+#!/usr/bin/env python3
+"""Monte Carlo simulator for Hub & Spoke liquidity, TVL, PPS and Router fee splits.
+
+Every path is simulated at once with NumPy: state arrays are shaped
+(paths,) for the Hub and (paths, spokes) for the spokes, and only the day loop
+is sequential. Semantics follow the contracts:
+
+  * deposits land on spokes via LocalDepositGateway, minting USDzy at the
+    previous day's mirrored PPS after the deposit haircut;
+  * Router.fill borrows net + relayer fee + treasury share from the SpokeVault
+    (capped by maxUtilizationBps), leaves the LP share in the vault and is
+    repaid in full after the chain's settlement lag;
+  * Hub.requestWithdraw burns shares at the current PPS and claimWithdraw pays
+    out of Hub liquidity, so unpaid claims queue up;
+  * spoke buffers target `buffer ratio x trailing 7-day average fill outflow`
+    (a model assumption: Router.avg7d only averages daily TVL snapshots);
+    excess idle liquidity is sent to the Hub (SpokeVault.sendIdle) and the Hub
+    tops up spokes that fall short, both subject to the chain's bridge lag.
+
+The share of paths reaching the PROJECTIONS.md TVL targets ($5.0M by day 90,
+$17.25M by day 180) is reported next to the TVL percentiles.
+
+Usage:
+  python scripts/hub_spoke_sim.py --paths 10000 --days 180
+  python scripts/hub_spoke_sim.py --buffer-superchain 0.7,0.75,0.8 --protocol-fee-bps 0,5 --json sim.json
+  python scripts/hub_spoke_sim.py --days 90 --tvl-target 30=1500000 --tvl-target 90=5000000
+"""
+import argparse
+import itertools
+import json
+import sys
+import time
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+# Buffer ratios and settlement lag (days) per chain family, see PROJECTIONS.md §1.
+KIND_DEFAULTS = {
+    "superchain": {"buffer_ratio": 0.75, "settle_days": 1},
+    "non-evm": {"buffer_ratio": 1.0, "settle_days": 3},
+}
+
+# (name, kind, share of deposits and fill volume)
+DEFAULT_SPOKES: List[Tuple[str, str, float]] = [
+    ("optimism", "superchain", 0.35),
+    ("mode", "superchain", 0.15),
+    ("zora", "superchain", 0.10),
+    ("solana", "non-evm", 0.25),
+    ("sui", "non-evm", 0.15),
+]
+
+DEFAULT_PARAMS: Dict[str, Any] = {
+    # Month-1 bootstrap TVL in USD (PROJECTIONS.md §2) and the share seeded on the Hub
+    "seed_tvl": 830_000.0,
+    "hub_seed_share": 0.5,
+    # Daily flows as a fraction of TVL; defaults grow ~1.7%/day, roughly the 6-month target
+    "deposit_rate": 0.025,
+    "withdraw_rate": 0.008,
+    "fill_turnover": 0.10,
+    "flow_sigma": 0.5,
+    # Gateway / Hub
+    "haircut_bps": 10,
+    # Router fees (bps)
+    "protocol_fee_bps": 5,
+    "relayer_fee_bps": 5,
+    "protocol_share_bps": 2500,
+    # SpokeVault
+    "max_utilization_bps": 9000,
+    # Per-kind overrides; None falls back to KIND_DEFAULTS
+    "buffer_superchain": None,
+    "buffer_non_evm": None,
+}
+
+PERCENTILES = (5, 50, 95)
+
+# (day, TVL in USD) from PROJECTIONS.md §2: Months 1-3 and Months 3-6 targets
+DEFAULT_TVL_TARGETS: List[Tuple[int, float]] = [(90, 5_000_000.0), (180, 17_250_000.0)]
+
+
+def validate_params(params: Dict[str, Any]) -> None:
+    # Mirror Router/SpokeVault setter guards so sweeps cannot explore unreachable configs
+    if params["protocol_fee_bps"] > 5:
+        raise ValueError("ProtocolFee>5bps")
+    if not 0 <= params["protocol_share_bps"] <= 10000:
+        raise ValueError("Split!=100%")
+    if not 0 < params["max_utilization_bps"] <= 10000:
+        raise ValueError("max_utilization_bps must be in (0, 10000]")
+    if params["seed_tvl"] <= 0:
+        raise ValueError("seed_tvl must be positive")
+    if not 0 <= params["hub_seed_share"] <= 1:
+        raise ValueError("hub_seed_share must be in [0, 1]")
+    for key in ("relayer_fee_bps", "haircut_bps"):
+        if not 0 <= params[key] <= 10000:
+            raise ValueError(f"{key} must be in [0, 10000]")
+    if params["protocol_fee_bps"] < 0:
+        raise ValueError("protocol_fee_bps must be >= 0")
+    if params["withdraw_rate"] > 1:
+        raise ValueError("withdraw_rate must be <= 1")
+    for key in ("deposit_rate", "withdraw_rate", "fill_turnover", "flow_sigma"):
+        if params[key] < 0:
+            raise ValueError(f"{key} must be >= 0")
+    for kind in ("buffer_superchain", "buffer_non_evm"):
+        if params[kind] is not None and params[kind] < 0:
+            raise ValueError(f"{kind} must be >= 0")
+
+
+def _noise(rng: np.random.Generator, sigma: float, shape: Tuple[int, ...]) -> np.ndarray:
+    # Mean-one lognormal multiplier
+    return np.exp(sigma * rng.standard_normal(shape) - 0.5 * sigma * sigma)
+
+
+def simulate(params: Dict[str, Any], spokes: List[Tuple[str, str, float]], paths: int, days: int, seed: int,
+             record_days: Sequence[int] = ()) -> Dict[str, Any]:
+    """Run `paths` scenarios for `days` days; returns per-path arrays and per-day percentile bands.
+
+    For every day in `record_days` (1-based) the per-path end-of-day TVL is kept in "tvl_on_day".
+    """
+    validate_params(params)
+    if paths < 1 or days < 1:
+        raise ValueError("paths and days must be >= 1")
+    if any(not 1 <= d <= days for d in record_days):
+        raise ValueError(f"record_days must be within 1..{days}")
+    if not spokes or any(w < 0 for _, _, w in spokes) or sum(w for _, _, w in spokes) <= 0:
+        raise ValueError("spokes need non-negative weights with a positive sum")
+    rng = np.random.default_rng(seed)
+    P, S = paths, len(spokes)
+
+    weights = np.array([w for _, _, w in spokes], dtype=float)
+    weights /= weights.sum()
+    ratio_override = {"superchain": params["buffer_superchain"], "non-evm": params["buffer_non_evm"]}
+    buffer_ratio = np.array([
+        ratio_override[k] if ratio_override[k] is not None else KIND_DEFAULTS[k]["buffer_ratio"] for _, k, _ in spokes
+    ])
+    settle = np.array([KIND_DEFAULTS[k]["settle_days"] for _, k, _ in spokes], dtype=int)
+    ring = int(settle.max()) + 1
+    cols = np.arange(S)
+
+    sigma = params["flow_sigma"]
+    haircut = params["haircut_bps"] / 10000
+    protocol_fee = params["protocol_fee_bps"] / 10000
+    relayer_fee = params["relayer_fee_bps"] / 10000
+    protocol_share = params["protocol_share_bps"] / 10000
+    max_util = params["max_utilization_bps"] / 10000
+
+    seed_tvl = params["seed_tvl"]
+    hub = np.full(P, seed_tvl * params["hub_seed_share"])
+    spoke_bal = np.tile(seed_tvl * (1 - params["hub_seed_share"]) * weights, (P, 1))
+    debt = np.zeros((P, S))
+    shares = np.full(P, seed_tvl)
+    mirror_pps = np.ones(P)
+    queue = np.zeros(P)
+
+    # In-flight amounts keyed by arrival day modulo `ring`
+    repay_ring = np.zeros((ring, P, S))
+    to_spoke_ring = np.zeros((ring, P, S))
+    to_hub_ring = np.zeros((ring, P))
+    # Trailing 7-day fill outflow per spoke (model assumption, not Router.daysBuf, which holds TVL
+    # snapshots); warmed with expected day-0 demand
+    outflow_buf = np.tile(seed_tvl * params["fill_turnover"] * weights, (7, P, 1))
+
+    acc = {k: np.zeros(P) for k in (
+        "deposits", "withdrawals", "fill_demand", "filled", "protocol_fees", "to_treasury", "to_lps", "relayer_fees",
+        "haircut", "pushed_to_hub", "pulled_from_hub", "max_queue", "queue_days",
+    )}
+    shortfall_days = np.zeros((P, S))
+    tvl_on_day: Dict[int, np.ndarray] = {}
+    bands = {k: np.zeros((days, len(PERCENTILES))) for k in ("tvl", "pps", "hub_share")}
+
+    for t in range(days):
+        slot = t % ring
+
+        # Arrivals: Router.repay, Hub top-ups and spoke pushes that finished bridging
+        repaid = repay_ring[slot]
+        spoke_bal += repaid + to_spoke_ring[slot]
+        debt = np.maximum(debt - repaid, 0.0)
+        hub += to_hub_ring[slot]
+        repay_ring[slot] = 0.0
+        to_spoke_ring[slot] = 0.0
+        to_hub_ring[slot] = 0.0
+
+        in_flight = repay_ring.sum(axis=(0, 2)) + to_spoke_ring.sum(axis=(0, 2)) + to_hub_ring.sum(axis=0)
+        tvl = hub + spoke_bal.sum(axis=1) + in_flight - queue
+        pps = np.where(shares > 0, tvl / np.maximum(shares, 1e-12), 1.0)
+
+        # LocalDepositGateway.deposit: haircut, then shares at the mirrored PPS
+        dep = tvl[:, None] * params["deposit_rate"] * weights * _noise(rng, sigma, (P, S))
+        spoke_bal += dep
+        dep_total = dep.sum(axis=1)
+        shares += dep_total * (1 - haircut) / mirror_pps
+        acc["deposits"] += dep_total
+        acc["haircut"] += dep_total * haircut
+
+        # Router.fill against SpokeVault.borrow utilization cap
+        demand = tvl[:, None] * params["fill_turnover"] * weights * _noise(rng, sigma, (P, S))
+        capacity = np.clip(max_util * spoke_bal - debt, 0.0, spoke_bal)
+        filled = np.minimum(demand, capacity)
+        p_fee = filled * protocol_fee
+        r_fee = filled * relayer_fee
+        treasury = p_fee * protocol_share
+        net = np.maximum(filled - p_fee - r_fee, 0.0)
+        borrowed = net + r_fee + treasury
+        spoke_bal -= borrowed
+        debt += borrowed
+        repay_ring[(t + settle) % ring, :, cols] += filled.T
+        outflow_buf[t % 7] = filled
+        shortfall_days += demand > filled * (1 + 1e-9)
+        acc["fill_demand"] += demand.sum(axis=1)
+        acc["filled"] += filled.sum(axis=1)
+        acc["protocol_fees"] += p_fee.sum(axis=1)
+        acc["to_treasury"] += treasury.sum(axis=1)
+        acc["to_lps"] += (p_fee - treasury).sum(axis=1)
+        acc["relayer_fees"] += r_fee.sum(axis=1)
+
+        # Hub.requestWithdraw burns at current PPS; claimWithdraw pays from Hub liquidity
+        req = np.minimum(shares * params["withdraw_rate"] * _noise(rng, sigma, (P,)), shares)
+        shares -= req
+        queue += req * pps
+        paid = np.minimum(queue, hub)
+        hub -= paid
+        queue -= paid
+        acc["withdrawals"] += paid
+        acc["max_queue"] = np.maximum(acc["max_queue"], queue)
+        acc["queue_days"] += queue > 0
+
+        # Rebalance towards buffer = ratio * trailing 7-day average fill outflow
+        target = buffer_ratio * outflow_buf.sum(axis=0) / 7
+        needed_bal = (target + debt) / max_util
+        idle = np.maximum(spoke_bal - debt, 0.0)
+        push = np.clip(spoke_bal - needed_bal, 0.0, idle)
+        spoke_bal -= push
+        for lag in np.unique(settle):
+            to_hub_ring[(t + lag) % ring] += push[:, settle == lag].sum(axis=1)
+        want = np.maximum(needed_bal - spoke_bal - to_spoke_ring.sum(axis=0), 0.0)
+        want_total = want.sum(axis=1)
+        scale = np.where(want_total > hub, hub / np.maximum(want_total, 1e-12), 1.0)
+        pull = want * scale[:, None]
+        hub -= pull.sum(axis=1)
+        to_spoke_ring[(t + settle) % ring, :, cols] += pull.T
+        acc["pushed_to_hub"] += push.sum(axis=1)
+        acc["pulled_from_hub"] += pull.sum(axis=1)
+
+        # PpsBeacon posts once per day; gateways read it tomorrow
+        in_flight = repay_ring.sum(axis=(0, 2)) + to_spoke_ring.sum(axis=(0, 2)) + to_hub_ring.sum(axis=0)
+        tvl = hub + spoke_bal.sum(axis=1) + in_flight - queue
+        mirror_pps = np.where(shares > 0, tvl / np.maximum(shares, 1e-12), mirror_pps)
+        bands["tvl"][t] = np.percentile(tvl, PERCENTILES)
+        bands["pps"][t] = np.percentile(mirror_pps, PERCENTILES)
+        bands["hub_share"][t] = np.percentile(hub / np.maximum(tvl, 1e-12), PERCENTILES)
+        if t + 1 in record_days:
+            tvl_on_day[t + 1] = tvl.copy()
+
+    per_path = dict(acc)
+    per_path["final_tvl"] = tvl
+    per_path["final_pps"] = mirror_pps
+    per_path["fill_rate"] = acc["filled"] / np.maximum(acc["fill_demand"], 1e-12)
+    return {
+        "per_path": per_path,
+        "spoke_shortfall_days": {name: shortfall_days[:, i] for i, (name, _, _) in enumerate(spokes)},
+        "tvl_on_day": tvl_on_day,
+        "bands": bands,
+    }
+
+
+def summarize(result: Dict[str, Any], tvl_targets: Sequence[Tuple[int, float]] = ()) -> Dict[str, Dict[str, float]]:
+    """Mean and percentiles per series, plus P(TVL >= target) as "tvl_target_d<day>" for each target."""
+    out: Dict[str, Dict[str, float]] = {}
+    series = dict(result["per_path"])
+    series.update({f"shortfall_days_{k}": v for k, v in result["spoke_shortfall_days"].items()})
+    series.update({f"tvl_day{d}": v for d, v in result["tvl_on_day"].items()})
+    for k, v in series.items():
+        pct = np.percentile(v, PERCENTILES)
+        out[k] = {"mean": float(v.mean()), **{f"p{p}": float(x) for p, x in zip(PERCENTILES, pct)}}
+    for day, usd in tvl_targets:
+        tvl = result["tvl_on_day"][day]
+        out[f"tvl_target_d{day}"] = {"day": float(day), "target": usd, "p_hit": float((tvl >= usd).mean())}
+    return out
+
+
+def parse_list(raw: str, cast=float) -> List[Any]:
+    return [cast(x) for x in raw.split(",") if x.strip()]
+
+
+def tvl_target_arg(item: str) -> Tuple[int, float]:
+    """argparse type for --tvl-target DAY=USD."""
+    day, _, usd = item.partition("=")
+    try:
+        target = (int(day), float(usd))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected DAY=USD, e.g. 90=5000000; got {item!r}")
+    if target[0] < 1 or not target[1] > 0:
+        raise argparse.ArgumentTypeError(f"DAY must be >= 1 and USD > 0; got {item!r}")
+    return target
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Monte Carlo Hub & Spoke liquidity / TVL / PPS simulator")
+    parser.add_argument("--paths", type=int, default=10000, help="Scenarios simulated in parallel")
+    parser.add_argument("--days", type=int, default=180, help="Horizon in days")
+    parser.add_argument("--seed", type=int, default=7, help="RNG seed (shared across sweep points)")
+    parser.add_argument("--buffer-superchain", default=None, help="Comma list of Superchain buffer ratios")
+    parser.add_argument("--buffer-non-evm", default=None, help="Comma list of non-EVM buffer ratios")
+    parser.add_argument("--protocol-fee-bps", default=None, help="Comma list of Router protocol fee bps (<=5)")
+    parser.add_argument("--relayer-fee-bps", default=None, help="Comma list of Router relayer fee bps")
+    parser.add_argument("--protocol-share-bps", default=None, help="Comma list of protocol share bps (LP share = 10000 - x)")
+    for key in ("seed_tvl", "hub_seed_share", "deposit_rate", "withdraw_rate", "fill_turnover", "flow_sigma", "haircut_bps",
+                "max_utilization_bps"):
+        parser.add_argument(f"--{key.replace('_', '-')}", type=float, default=DEFAULT_PARAMS[key])
+    parser.add_argument("--tvl-target", action="append", type=tvl_target_arg, default=None, metavar="DAY=USD",
+                        help="Report P(TVL >= USD) at the end of DAY; repeatable (default: PROJECTIONS.md 90=5.0M, 180=17.25M)")
+    parser.add_argument("--json", default=None, help="Write summaries (and daily bands) to this path")
+    args = parser.parse_args()
+    if args.paths < 1 or args.days < 1:
+        parser.error("--paths and --days must be >= 1")
+    if args.tvl_target is None:
+        # Defaults past a shorter horizon are simply not reported
+        targets = [t for t in DEFAULT_TVL_TARGETS if t[0] <= args.days]
+    else:
+        targets = sorted(set(args.tvl_target))
+        if len({day for day, _ in targets}) != len(targets):
+            parser.error("--tvl-target: one target per DAY")
+        if any(day > args.days for day, _ in targets):
+            parser.error(f"--tvl-target DAY must be <= --days ({args.days})")
+
+    base = dict(DEFAULT_PARAMS)
+    for key in ("seed_tvl", "hub_seed_share", "deposit_rate", "withdraw_rate", "fill_turnover", "flow_sigma", "haircut_bps",
+                "max_utilization_bps"):
+        base[key] = getattr(args, key)
+
+    axes: Dict[str, List[Any]] = {}
+    if args.buffer_superchain:
+        axes["buffer_superchain"] = parse_list(args.buffer_superchain)
+    if args.buffer_non_evm:
+        axes["buffer_non_evm"] = parse_list(args.buffer_non_evm)
+    if args.protocol_fee_bps:
+        axes["protocol_fee_bps"] = parse_list(args.protocol_fee_bps, int)
+    if args.relayer_fee_bps:
+        axes["relayer_fee_bps"] = parse_list(args.relayer_fee_bps, int)
+    if args.protocol_share_bps:
+        axes["protocol_share_bps"] = parse_list(args.protocol_share_bps, int)
+
+    runs: List[Dict[str, Any]] = []
+    keys = list(axes.keys())
+    for combo in itertools.product(*[axes[k] for k in keys]) if keys else [()]:
+        params = {**base, **dict(zip(keys, combo))}
+        started = time.perf_counter()
+        try:
+            result = simulate(params, DEFAULT_SPOKES, args.paths, args.days, args.seed,
+                              record_days=sorted({day for day, _ in targets}))
+        except ValueError as e:
+            print(f"skipping {dict(zip(keys, combo))}: {e}", file=sys.stderr)
+            continue
+        elapsed = time.perf_counter() - started
+        runs.append({"point": dict(zip(keys, combo)), "params": params, "elapsed_s": elapsed,
+                     "summary": summarize(result, targets),
+                     "bands": {k: v.tolist() for k, v in result["bands"].items()}})
+
+    print(f"Hub & Spoke simulation: {args.paths} paths x {args.days} days, seed {args.seed}")
+    target_cols = [(f"tvl_target_d{day}", f"P>={usd / 1e6:g}M d{day}") for day, usd in targets]
+    header = f"{'point':<48} {'TVL p50':>14} {'TVL p5':>14} {'PPS p50':>9} {'fill p5':>8} {'LP fees p50':>12} {'treasury p50':>13} {'queue d p95':>11}"
+    header += "".join(f" {title:>15}" for _, title in target_cols) + f" {'secs':>6}"
+    print(header)
+    for r in runs:
+        s = r["summary"]
+        label = ", ".join(f"{k}={v}" for k, v in r["point"].items()) or "defaults"
+        hits = "".join(f" {s[key]['p_hit']:>15.3f}" for key, _ in target_cols)
+        print(f"{label:<48} {s['final_tvl']['p50']:>14,.0f} {s['final_tvl']['p5']:>14,.0f} {s['final_pps']['p50']:>9.5f} "
+              f"{s['fill_rate']['p5']:>8.3f} {s['to_lps']['p50']:>12,.0f} {s['to_treasury']['p50']:>13,.0f} "
+              f"{s['queue_days']['p95']:>11.0f}{hits} {r['elapsed_s']:>6.2f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"paths": args.paths, "days": args.days, "seed": args.seed, "tvl_targets": targets,
+                       "spokes": [list(s) for s in DEFAULT_SPOKES], "runs": runs}, f, indent=2)
+        print(f"Wrote {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+"""Rehearse the multi-chain deploy offline: one anvil node per chain, phases run concurrently.
+
+Each chain in the config gets its own anvil instance; its phases (forge scripts
+under script/) run in order on that node while chains run in parallel. Env vars
+for every phase come from one env index (config "env" plus per-chain "env"
+overrides), checked against the vars each script actually reads. Values may
+reference `${DEPLOYER}`, `${ACCOUNT_n}`, `${CHAIN_ID}` or any contract deployed by
+an earlier phase on the same chain (`${USDzy}`, `${MockERC20#1}` for the second one).
+Dev accounts and the broadcaster key are read from each node's `anvil --config-out`.
+
+forge broadcast logs, cache and artifacts go to the gitignored .dryrun/ directory,
+so rehearsals never touch broadcast/ or dirty the tree; only the report in docs/
+is written. Role wiring is decoded from RoleGranted/RoleRevoked/OwnershipTransferred
+logs, so grants made inside calls such as Factory.deploySpoke are included.
+
+The default config rehearses every production deploy script, including
+Deploy_Phase1 on base, which currently reverts: it calls initialize() on a bare
+`new USDzy()` whose constructor runs _disableInitializers(). `just dryrun` passes
+--keep-going so the other chains still finish and the report shows that failure.
+
+Commands run under the status tooling's execution layer: per-kind timeouts
+(--timeout script=SECONDS), a global --deadline, and one CancelToken shared by all
+chains. A failed chain (unless --keep-going), Ctrl-C or an expired deadline stops the
+other chains and shuts down their anvil nodes.
+
+Usage:
+  python scripts/multichain_dryrun.py [--config scripts/dryrun_chains.json] [--chains arbitrum,optimism] [--json out.json]
+"""
+import argparse
+import json
+import os
+import re
+import shutil
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from proc_runner import Deadline, cancel_on_signals, progress, run_parallel
+from vaults_dev_status import (DOCS_DIR, EXEC, ROLE_NAMES, ROOT, SCRIPT_DIR, TIMEOUTS, run, scan_script_envs,
+                               timeout_arg, write_file)
+
+DEFAULT_CONFIG = ROOT / "scripts" / "dryrun_chains.json"
+DRYRUN_DIR = ROOT / ".dryrun"
+BROADCAST_DIR = DRYRUN_DIR / "broadcast"
+# Keep every forge artifact of the rehearsal out of the tracked tree
+FOUNDRY_ENV = {
+    "FOUNDRY_BROADCAST": str(BROADCAST_DIR),
+    "FOUNDRY_CACHE_PATH": str(DRYRUN_DIR / "cache"),
+    "FOUNDRY_OUT": str(DRYRUN_DIR / "out"),
+}
+
+EXTRA_ROLE_NAMES = ["POSTER_ROLE", "TOPUP_ROLE"]
+# Top-level config calls worth reporting; role/ownership changes come from event logs instead
+WIRING_FUNCTIONS = ("setEndpoint", "setAdapter", "setFeeCollector", "setFeeSplit", "setProtocolFeeBps", "setRelayerFeeBps")
+TOPIC_ROLE_GRANTED = "0x2f8788117e7eff1d82e926ec794901d17c78024a50270940304540a733656f0d"
+TOPIC_ROLE_REVOKED = "0xf6391f5c32d9c69d2a47ea670b442974b53935d1edc7fd64eb21e047a839171b"
+TOPIC_OWNERSHIP_TRANSFERRED = "0x8be0079c531659141344cd1fd0a4f28419497f9722a3daafe3b4186f6b6457e0"
+REF_RE = re.compile(r"\$\{([A-Za-z0-9_#]+)\}")
+LOGGED_ADDR_RE = re.compile(r"(\w+)\s*[=:]\s*(0x[0-9a-fA-F]{40})\b")
+
+
+def role_hashes() -> Dict[str, str]:
+    """Map role hash -> role name (via `cast keccak`); DEFAULT_ADMIN_ROLE is bytes32(0)."""
+    hashes = {"0x" + "00" * 32: "DEFAULT_ADMIN_ROLE"}
+    for name in ROLE_NAMES + EXTRA_ROLE_NAMES:
+        if name == "DEFAULT_ADMIN_ROLE":
+            continue
+        code, out, _ = run(["cast", "keccak", name], kind="cast")
+        if code == 0:
+            hashes[out.strip().lower()] = name
+    return hashes
+
+
+def port_open(port: int) -> bool:
+    try:
+        with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+            return True
+    except OSError:
+        return False
+
+
+def wait_for_port(port: int, timeout: float, node: subprocess.Popen) -> bool:
+    """Wait until `node` listens on `port`; gives up early if it exits, on cancel or the global deadline."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline and not (EXEC["cancel"].cancelled or EXEC["deadline"].expired()):
+        if node.poll() is not None:
+            return False
+        if port_open(port):
+            return True
+        time.sleep(0.2)
+    return False
+
+
+def read_anvil_accounts(config_out: Path) -> Tuple[List[str], List[str]]:
+    """Return (addresses, private keys) from an `anvil --config-out` file."""
+    data = json.loads(config_out.read_text())
+    accounts, keys = data.get("available_accounts") or [], data.get("private_keys") or []
+    if not accounts or len(accounts) != len(keys):
+        raise ValueError(f"no dev accounts in {config_out}")
+    return accounts, keys
+
+
+def resolve_env(chain: Dict[str, Any], env_index: Dict[str, str], deployed: Dict[str, str], script: Path,
+                accounts: List[str]) -> Tuple[Dict[str, str], List[str]]:
+    """Resolve the env vars `script` reads; returns (env, missing required vars)."""
+    builtins = {"DEPLOYER": accounts[0], "CHAIN_ID": str(chain["chain_id"])}
+    builtins.update({f"ACCOUNT_{i}": a for i, a in enumerate(accounts)})
+    scope = {**builtins, **deployed}
+    env: Dict[str, str] = {}
+    missing: List[str] = []
+    for name, required in scan_script_envs(script).items():
+        raw = env_index.get(name)
+        if raw is None:
+            if required:
+                missing.append(name)
+            continue
+        unresolved = [ref for ref in REF_RE.findall(raw) if ref not in scope]
+        if unresolved:
+            if required:
+                missing.append(f"{name} (needs {', '.join(unresolved)})")
+            continue
+        env[name] = REF_RE.sub(lambda m: scope[m.group(1)], raw)
+    return env, missing
+
+
+def _topic_addr(topic: str) -> str:
+    return "0x" + topic[-40:]
+
+
+def decode_wiring_log(entry: Dict[str, Any], role_names: Dict[str, str]) -> Optional[Tuple[str, List[str]]]:
+    """Decode a RoleGranted/RoleRevoked/OwnershipTransferred receipt log to (event, args)."""
+    topics = [str(t).lower() for t in entry.get("topics") or []]
+    if len(topics) == 4 and topics[0] in (TOPIC_ROLE_GRANTED, TOPIC_ROLE_REVOKED):
+        event = "RoleGranted" if topics[0] == TOPIC_ROLE_GRANTED else "RoleRevoked"
+        role = role_names.get(topics[1], topics[1])
+        return event, [role, f"account={_topic_addr(topics[2])}", f"sender={_topic_addr(topics[3])}"]
+    if len(topics) == 3 and topics[0] == TOPIC_OWNERSHIP_TRANSFERRED:
+        return "OwnershipTransferred", [f"from={_topic_addr(topics[1])}", f"to={_topic_addr(topics[2])}"]
+    return None
+
+
+def parse_broadcast(script: Path, chain_id: int, role_names: Dict[str, str], known: Dict[str, str]) -> Dict[str, Any]:
+    """Extract gas, deployed contracts and role/config wiring from forge's run-latest.json.
+
+    `known` maps lowercase address -> name for contracts deployed by earlier phases.
+    """
+    res: Dict[str, Any] = {"gas_used": 0, "contracts": [], "wiring": []}
+    path = BROADCAST_DIR / script.name / str(chain_id) / "run-latest.json"
+    if not path.exists():
+        return res
+    try:
+        data = json.loads(path.read_text())
+    except Exception:
+        return res
+    names = dict(known)
+    for tx in data.get("transactions", []):
+        if tx.get("transactionType") in ("CREATE", "CREATE2") and tx.get("contractAddress"):
+            res["contracts"].append({"name": tx.get("contractName") or "unknown", "address": tx["contractAddress"]})
+        for extra in tx.get("additionalContracts") or []:
+            res["contracts"].append({"name": extra.get("contractName") or "created-in-call", "address": extra.get("address")})
+        fn = (tx.get("function") or "").split("(")[0]
+        if fn in WIRING_FUNCTIONS:
+            addr = str(tx.get("contractAddress") or "").lower()
+            res["wiring"].append({"contract": tx.get("contractName") or names.get(addr, "unknown"), "address": addr,
+                                  "function": fn, "args": list(tx.get("arguments") or [])})
+    for c in res["contracts"]:
+        if c["address"]:
+            names.setdefault(c["address"].lower(), c["name"])
+    for rc in data.get("receipts", []):
+        gas = rc.get("gasUsed") or "0x0"
+        res["gas_used"] += int(gas, 16) if isinstance(gas, str) else int(gas)
+        for entry in rc.get("logs") or []:
+            decoded = decode_wiring_log(entry, role_names)
+            if decoded is None:
+                continue
+            addr = str(entry.get("address") or "").lower()
+            res["wiring"].append({"contract": names.get(addr, addr), "address": addr, "function": decoded[0],
+                                  "args": decoded[1]})
+    return res
+
+
+def run_chain(chain: Dict[str, Any], env_index: Dict[str, str], role_names: Dict[str, str], startup_timeout: float) -> Dict[str, Any]:
+    name, chain_id, port = chain["name"], int(chain["chain_id"]), int(chain["port"])
+    report: Dict[str, Any] = {"name": name, "chain_id": chain_id, "port": port, "ok": False, "phases": [], "deployed": {}}
+    rpc = f"http://127.0.0.1:{port}"
+    config_out = DRYRUN_DIR / f"anvil-{name}.json"
+    config_out.parent.mkdir(parents=True, exist_ok=True)
+    if config_out.exists():
+        config_out.unlink()
+    # Never rehearse against a node we did not start (e.g. one left over from an earlier run)
+    if port_open(port):
+        report["error"] = f"port {port} is already in use; stop whatever listens there or change the chain's port"
+        progress(name, report["error"])
+        return report
+    anvil_log = DRYRUN_DIR / f"anvil-{name}.log"
+    with open(anvil_log, "w", encoding="utf-8") as sink:
+        anvil = subprocess.Popen(["anvil", "--port", str(port), "--chain-id", str(chain_id), "--silent",
+                                  "--config-out", str(config_out)],
+                                 stdout=sink, stderr=subprocess.STDOUT)
+    try:
+        if not wait_for_port(port, startup_timeout, anvil):
+            if EXEC["cancel"].cancelled:
+                report["error"] = f"cancelled: {EXEC['cancel'].reason}"
+            elif EXEC["deadline"].expired():
+                report["error"] = "global deadline expired"
+            elif anvil.poll() is not None:
+                tail = anvil_log.read_text(errors="replace").strip().splitlines()[-3:]
+                report["error"] = f"anvil exited with code {anvil.returncode} before opening port {port}"
+                if tail:
+                    report["error"] += f": {' / '.join(tail)}"
+            else:
+                report["error"] = f"anvil did not open port {port} within {startup_timeout}s"
+            progress(name, report["error"])
+            return report
+        try:
+            accounts, keys = read_anvil_accounts(config_out)
+        except (OSError, ValueError) as e:
+            report["error"] = f"cannot read anvil accounts: {e}"
+            progress(name, report["error"])
+            return report
+        progress(name, f"anvil up on {rpc} (chain id {chain_id}), broadcasting as {accounts[0]}")
+        deployed: Dict[str, str] = {}
+        merged_index = {**env_index, **chain.get("env", {})}
+        for phase in chain["phases"]:
+            script = SCRIPT_DIR / f"{phase}.s.sol"
+            entry: Dict[str, Any] = {"phase": phase, "ok": False}
+            report["phases"].append(entry)
+            if EXEC["cancel"].cancelled:
+                entry["error"] = f"cancelled: {EXEC['cancel'].reason}"
+                progress(name, f"{phase}: {entry['error']}")
+                return report
+            if not script.exists():
+                entry["error"] = f"missing {os.path.relpath(script, ROOT)}"
+                progress(name, f"{phase}: {entry['error']}")
+                return report
+            env, missing = resolve_env(chain, merged_index, deployed, script, accounts)
+            entry["env"] = env
+            if missing:
+                entry["error"] = f"unresolved env: {', '.join(missing)}"
+                progress(name, f"{phase}: {entry['error']}")
+                return report
+            progress(name, f"{phase}: running")
+            started = time.monotonic()
+            code, out, err = run(
+                ["forge", "script", os.path.relpath(script, ROOT), "--rpc-url", rpc, "--broadcast",
+                 "--private-key", keys[0]],
+                env={**os.environ, **FOUNDRY_ENV, **env},
+                kind="script",
+                log_name=f"{name}:{phase}",
+            )
+            entry["duration_s"] = round(time.monotonic() - started, 2)
+            if code != 0:
+                entry["error"] = (err or out).strip().splitlines()[-20:]
+                progress(name, f"{phase}: failed (exit {code})")
+                return report
+            entry["logged"] = {k: v for k, v in LOGGED_ADDR_RE.findall(out)}
+            known = {v.lower(): k for k, v in {**entry["logged"], **deployed}.items()}
+            entry.update(parse_broadcast(script, chain_id, role_names, known))
+            entry["ok"] = True
+            for c in entry["contracts"]:
+                key = c["name"]
+                n = 1
+                while key in deployed:
+                    key = f"{c['name']}#{n}"
+                    n += 1
+                deployed[key] = c["address"]
+            for k, v in entry["logged"].items():
+                deployed.setdefault(k, v)
+            progress(name, f"{phase}: ok, gas {entry['gas_used']:,}, {len(entry['contracts'])} contracts, {entry['duration_s']}s")
+        report["deployed"] = deployed
+        report["ok"] = True
+        return report
+    finally:
+        anvil.terminate()
+        try:
+            anvil.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            anvil.kill()
+
+
+def render_report(reports: List[Dict[str, Any]]) -> str:
+    lines: List[str] = []
+    lines.append("# Multi-chain Deploy Dry-Run (auto-generated)")
+    lines.append("")
+    total_gas = sum(p.get("gas_used", 0) for r in reports for p in r["phases"])
+    lines.append(f"- Chains: {len(reports)} ({sum(1 for r in reports if r['ok'])} ok)")
+    lines.append(f"- Total gas used: {total_gas:,}")
+    lines.append("")
+    for r in reports:
+        lines.append(f"## {r['name']} (chain id {r['chain_id']}) — {'ok' if r['ok'] else 'FAILED'}")
+        if r.get("error"):
+            lines.append(f"- error: {r['error']}")
+        lines.append("")
+        lines.append("| Phase | Status | Gas used | Duration (s) |")
+        lines.append("|-------|--------|----------|--------------|")
+        for p in r["phases"]:
+            lines.append(f"| {p['phase']} | {'ok' if p['ok'] else 'failed'} | {p.get('gas_used', 0):,} | {p.get('duration_s', '-')} |")
+        for p in r["phases"]:
+            if p.get("error"):
+                err = p["error"] if isinstance(p["error"], str) else " / ".join(p["error"][-3:])
+                lines.append(f"- {p['phase']} error: {err}")
+        lines.append("")
+        lines.append("Deployed addresses:")
+        deployed = r.get("deployed") or {}
+        if not deployed:
+            lines.append("- (none)")
+        for k, v in deployed.items():
+            lines.append(f"- {k}: {v}")
+        lines.append("")
+        lines.append("Role & config wiring:")
+        wiring = [w for p in r["phases"] for w in p.get("wiring", [])]
+        if not wiring:
+            lines.append("- (none)")
+        for w in wiring:
+            lines.append(f"- {w['contract']}.{w['function']}({', '.join(str(a) for a in w['args'])})")
+        lines.append("")
+    return "\n".join(lines) + "\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel multi-chain deploy rehearsal on local anvil nodes")
+    parser.add_argument("--config", default=str(DEFAULT_CONFIG), help="Chains + env index JSON")
+    parser.add_argument("--chains", default=None, help="Comma list of chain names to run (default: all)")
+    parser.add_argument("--startup-timeout", type=float, default=30.0, help="Seconds to wait for each anvil node")
+    parser.add_argument("--json", default=None, help="Also write the raw report as JSON")
+    parser.add_argument("--deadline", type=float, default=None, help="Global wall-clock budget in seconds for the whole rehearsal")
+    parser.add_argument("--timeout", action="append", default=[], type=timeout_arg, metavar="KIND=SECONDS",
+                        help=f"Per-command timeout override (kinds: {', '.join(TIMEOUTS)}; <= 0 or none disables)")
+    parser.add_argument("--keep-going", action="store_true", help="Do not stop the other chains when one fails")
+    args = parser.parse_args()
+
+    TIMEOUTS.update(args.timeout)
+    EXEC["deadline"] = Deadline(args.deadline)
+    cancel_on_signals(EXEC["cancel"])
+
+    config = json.loads(Path(args.config).read_text())
+    chains = config["chains"]
+    if args.chains is not None:
+        wanted = [n.strip() for n in args.chains.split(",") if n.strip()]
+        unknown = sorted(set(wanted) - {c["name"] for c in chains})
+        if unknown:
+            parser.error(f"--chains: unknown chain(s) {', '.join(unknown)}; "
+                         f"{args.config} defines {', '.join(c['name'] for c in chains)}")
+        chains = [c for c in chains if c["name"] in wanted]
+    if not chains:
+        parser.error("no chains selected")
+    ids = [c["chain_id"] for c in chains]
+    ports = [c["port"] for c in chains]
+    if len(set(ids)) != len(ids) or len(set(ports)) != len(ports):
+        print("chain ids and ports must be unique per chain", file=sys.stderr)
+        sys.exit(1)
+
+    for tool in ("anvil", "forge", "cast"):
+        if shutil.which(tool) is None:
+            print(f"{tool} not found on PATH; install Foundry to run the dry-run", file=sys.stderr)
+            sys.exit(1)
+
+    # Compile once so concurrent `forge script` runs only hit the cache
+    code, out, err = run(["forge", "build"], env={**os.environ, **FOUNDRY_ENV}, kind="build", log_name="build")
+    if code != 0:
+        print(err or out, file=sys.stderr)
+        print("forge build failed", file=sys.stderr)
+        sys.exit(1)
+
+    role_names = role_hashes()
+    results = run_parallel(
+        {c["name"]: (lambda c=c: run_chain(c, config.get("env", {}), role_names, args.startup_timeout)) for c in chains},
+        EXEC["cancel"],
+        max_workers=len(chains),
+        failed=None if args.keep_going else (lambda r: not r["ok"]),
+    )
+    reports = list(results.values())
+
+    write_file(DOCS_DIR / "DRYRUN_MULTICHAIN.md", render_report(reports))
+    if args.json:
+        write_file(Path(args.json), json.dumps(reports, indent=2))
+    print("Dry-run report:")
+    print(f" - {DOCS_DIR / 'DRYRUN_MULTICHAIN.md'}")
+    if not all(r["ok"] for r in reports):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""Subprocess execution with deadlines, cooperative cancellation and bounded streamed capture.
+
+Every command gets its own timeout plus an optional shared Deadline; commands
+that run side by side share a CancelToken so one failure, a signal or an
+expired deadline stops the rest. stdout/stderr are read line by line into
+fixed-size ring buffers (optionally teed to a log file), so a chatty
+`forge test --gas-report` cannot grow memory without bound. Progress lines
+go to stderr.
+"""
+import collections
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import IO, Callable, Deque, Dict, List, NamedTuple, Optional, TypeVar
+
+TIMEOUT_RC = 124  # same code as coreutils `timeout`
+CANCELLED_RC = 130
+NOT_FOUND_RC = 127
+DEFAULT_RING_LINES = 2000
+MAX_LINE_CHARS = 64 * 1024  # longer lines are truncated in the ring (the log file keeps them whole)
+TERM_GRACE_S = 5.0
+POLL_S = 0.1
+HEARTBEAT_S = 30.0
+
+T = TypeVar("T")
+
+
+class Deadline:
+    """Absolute monotonic deadline shared by a whole job; None means unbounded."""
+
+    def __init__(self, seconds: Optional[float] = None):
+        self.at = None if seconds is None else time.monotonic() + seconds
+
+    def remaining(self) -> Optional[float]:
+        return None if self.at is None else max(0.0, self.at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.at is not None and time.monotonic() >= self.at
+
+
+class CancelToken:
+    """Thread-safe cancellation flag checked by every running command."""
+
+    def __init__(self):
+        self._event = threading.Event()
+        self.reason = ""
+
+    def cancel(self, reason: str = "cancelled"):
+        if not self._event.is_set():
+            self.reason = reason
+            self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+
+class CommandResult(NamedTuple):
+    code: int
+    out: str
+    err: str
+    timed_out: bool
+    cancelled: bool
+    duration: float
+    dropped_lines: int
+    log_path: Optional[Path]
+
+
+def progress(label: str, msg: str):
+    print(f"[{label}] {msg}", file=sys.stderr, flush=True)
+
+
+def _pump(stream: IO[str], ring: Deque[str], counter: List[int], sink: Optional[IO[str]], lock: threading.Lock,
+          echo: Optional[str]):
+    skipping = False
+    for chunk in iter(lambda: stream.readline(MAX_LINE_CHARS), ""):
+        if sink is not None:
+            with lock:
+                sink.write(chunk)
+        # readline(size) splits an over-long line into chunks; keep only the first one
+        cut = len(chunk) >= MAX_LINE_CHARS and not chunk.endswith("\n")
+        if not skipping:
+            line = chunk + " [line truncated]\n" if cut else chunk
+            ring.append(line)
+            counter[0] += 1
+            if echo is not None:
+                sys.stderr.write(f"[{echo}] {line}")
+        skipping = cut
+    stream.close()
+
+
+def _signal_group(p: subprocess.Popen, sig: int):
+    # Signal the whole process group so `bash -lc` wrappers do not leave orphans
+    try:
+        if os.name == "posix":
+            os.killpg(p.pid, sig)
+        elif sig == signal.SIGTERM:
+            p.terminate()
+        else:
+            p.kill()
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def _terminate(p: subprocess.Popen):
+    _signal_group(p, signal.SIGTERM)
+    try:
+        p.wait(timeout=TERM_GRACE_S)
+    except subprocess.TimeoutExpired:
+        _signal_group(p, signal.SIGKILL if os.name == "posix" else signal.SIGTERM)
+        p.wait()
+
+
+def _reap_readers(p: subprocess.Popen, readers: List[threading.Thread]):
+    """Kill whatever still holds the pipes (e.g. a backgrounded grandchild), then join the readers."""
+    for sig in (signal.SIGTERM, signal.SIGKILL if os.name == "posix" else signal.SIGTERM):
+        if not any(t.is_alive() for t in readers):
+            return
+        _signal_group(p, sig)
+        for t in readers:
+            t.join(TERM_GRACE_S)
+
+
+def run_command(cmd: List[str], cwd: Optional[Path] = None, env: Optional[Dict[str, str]] = None,
+                timeout: Optional[float] = None, deadline: Optional[Deadline] = None,
+                cancel: Optional[CancelToken] = None, ring_lines: Optional[int] = DEFAULT_RING_LINES,
+                log_path: Optional[Path] = None, label: Optional[str] = None, echo: bool = False) -> CommandResult:
+    """Run `cmd` until it exits, its timeout or the shared deadline passes, or `cancel` fires.
+
+    Only the last `ring_lines` lines of each stream are kept (None keeps all);
+    with `log_path` the full interleaved output is also written to disk.
+    Progress is reported on stderr when `label` is given.
+    """
+    started = time.monotonic()
+    if cancel is not None and cancel.cancelled:
+        return CommandResult(CANCELLED_RC, "", f"skipped: {cancel.reason}", False, True, 0.0, 0, None)
+    if deadline is not None and deadline.expired():
+        return CommandResult(TIMEOUT_RC, "", "skipped: global deadline expired", True, False, 0.0, 0, None)
+
+    sink: Optional[IO[str]] = None
+    if log_path is not None:
+        log_path.parent.mkdir(parents=True, exist_ok=True)
+        sink = open(log_path, "w", encoding="utf-8")
+    try:
+        try:
+            p = subprocess.Popen(cmd, cwd=str(cwd) if cwd else None, env=env, stdout=subprocess.PIPE,
+                                 stderr=subprocess.PIPE, text=True, errors="replace", bufsize=1,
+                                 start_new_session=(os.name == "posix"))
+        except FileNotFoundError as e:
+            return CommandResult(NOT_FOUND_RC, "", str(e), False, False, 0.0, 0, None)
+        if label:
+            progress(label, f"started: {' '.join(cmd)}")
+
+        lock = threading.Lock()
+        rings = (collections.deque(maxlen=ring_lines), collections.deque(maxlen=ring_lines))
+        counts = ([0], [0])
+        readers = [
+            threading.Thread(target=_pump, args=(s, r, c, sink, lock, label if echo else None), daemon=True)
+            for s, r, c in zip((p.stdout, p.stderr), rings, counts)
+        ]
+        for t in readers:
+            t.start()
+
+        limit = None if timeout is None else started + timeout
+        timed_out = cancelled = False
+        next_beat = started + HEARTBEAT_S
+        # Limits apply until the output is drained too: a descendant that outlives the
+        # child can keep stdout/stderr open after p.poll() has returned
+        while p.poll() is None or any(t.is_alive() for t in readers):
+            now = time.monotonic()
+            if cancel is not None and cancel.cancelled:
+                cancelled = True
+            elif (limit is not None and now >= limit) or (deadline is not None and deadline.expired()):
+                timed_out = True
+            if cancelled or timed_out:
+                if p.poll() is None:
+                    _terminate(p)
+                break
+            if label and now >= next_beat:
+                progress(label, f"running {now - started:.0f}s, {counts[0][0] + counts[1][0]} lines")
+                next_beat = now + HEARTBEAT_S
+            time.sleep(POLL_S)
+        _reap_readers(p, readers)
+    finally:
+        if sink is not None:
+            sink.close()
+
+    duration = time.monotonic() - started
+    dropped = sum(max(0, c[0] - len(r)) for c, r in zip(counts, rings))
+    out, err = "".join(rings[0]), "".join(rings[1])
+    code = p.returncode
+    if timed_out:
+        code = TIMEOUT_RC
+        err += f"\n[timed out after {duration:.1f}s]\n"
+    elif cancelled:
+        code = CANCELLED_RC
+        err += f"\n[cancelled: {cancel.reason}]\n"
+    if label:
+        state = "timed out" if timed_out else "cancelled" if cancelled else f"exit {code}"
+        extra = f", {dropped} lines only in {log_path}" if dropped and log_path else f", {dropped} lines dropped" if dropped else ""
+        progress(label, f"{state} in {duration:.1f}s{extra}")
+    return CommandResult(code, out, err, timed_out, cancelled, duration, dropped, log_path)
+
+
+def cancel_on_signals(token: CancelToken):
+    """Turn SIGINT/SIGTERM into cooperative cancellation instead of an abrupt exit."""
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda signum, _frame: token.cancel(f"signal {signum}"))
+
+
+def run_parallel(jobs: Dict[str, Callable[[], T]], cancel: CancelToken, max_workers: int = 4,
+                 failed: Optional[Callable[[T], bool]] = None) -> Dict[str, T]:
+    """Run named callables concurrently; results come back in job order.
+
+    Jobs observe `cancel` themselves (e.g. by passing it to run_command). When
+    `failed` flags a result, `cancel` fires so the sibling jobs stop early.
+    """
+
+    def one(name: str, job: Callable[[], T]) -> T:
+        res = job()
+        if failed is not None and failed(res):
+            cancel.cancel(f"{name} failed")
+        return res
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        futures = {name: pool.submit(one, name, job) for name, job in jobs.items()}
+        return {name: f.result() for name, f in futures.items()}
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 import argparse
 import json
+import math
 import os
 import re
 import shutil
@@ -10,6 +11,8 @@ from glob import glob
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
+from proc_runner import DEFAULT_RING_LINES, CancelToken, Deadline, cancel_on_signals, progress, run_command, run_parallel
+
 ROOT = Path(__file__).resolve().parents[1]
 SRC = ROOT / "src"
 SCRIPT_DIR = ROOT / "script"
@@ -48,42 +51,83 @@ ROLE_NAMES = [
 ]
 
 
-def run(cmd: List[str], cwd: Optional[Path] = None, check: bool = False) -> Tuple[int, str, str]:
-    p = subprocess.Popen(cmd, cwd=str(cwd or ROOT), stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-    out, err = p.communicate()
-    if check and p.returncode != 0:
-        raise subprocess.CalledProcessError(p.returncode, cmd, output=out, stderr=err)
-    return p.returncode, out, err
+# Per-command timeouts in seconds, keyed by kind; override with --timeout KIND=SECONDS
+TIMEOUTS: Dict[str, Optional[float]] = {
+    "version": 30,
+    "build": 900,
+    "inspect": 120,
+    "gas": 1800,
+    "slither": 1800,
+    "cast": 30,
+    "script": 900,
+}
 
+# Execution settings shared by every run() call; configured from CLI in main()
+EXEC: Dict[str, Any] = {
+    "deadline": Deadline(None),
+    "cancel": CancelToken(),
+    "log_dir": None,
+    "ring_lines": DEFAULT_RING_LINES,
+    "echo": False,
+    "incidents": [],
+}
 
-def detect_tools() -> Dict[str, str]:
-    tools = {}
-    for name, args in (
-        ("forge", ["forge", "--version"]),
-        ("cast", ["cast", "--version"]),
-        ("solc", ["solc", "--version"]),
-        ("slither", ["slither", "--version"]),
-    ):
-        code, out, err = run(args)
-        tools[name] = (out or err).strip() if code == 0 else "absent"
-    return tools
+
+def run(cmd: List[str], cwd: Optional[Path] = None, check: bool = False, env: Optional[Dict[str, str]] = None,
+        kind: Optional[str] = None, log_name: Optional[str] = None, bounded: bool = True) -> Tuple[int, str, str]:
+    """Run a command under the shared deadline/cancel token.
+
+    `kind` selects the timeout from TIMEOUTS; `log_name` turns on stderr progress
+    and, with --log-dir, tees full output to <log-dir>/<log_name>.log. Output kept
+    in memory is capped to the last --ring-lines lines unless `bounded` is False.
+    """
+    log_dir: Optional[Path] = EXEC["log_dir"]
+    res = run_command(
+        cmd,
+        cwd=cwd or ROOT,
+        env=env,
+        timeout=TIMEOUTS.get(kind) if kind else None,
+        deadline=EXEC["deadline"],
+        cancel=EXEC["cancel"],
+        ring_lines=EXEC["ring_lines"] if bounded else None,
+        log_path=(log_dir / f"{log_name}.log") if (log_dir and log_name) else None,
+        label=log_name,
+        echo=EXEC["echo"] and log_name is not None,
+    )
+    if res.timed_out or res.cancelled:
+        EXEC["incidents"].append(f"{' '.join(cmd)}: {'timed out' if res.timed_out else 'cancelled'} after {res.duration:.1f}s")
+    if check and res.code != 0:
+        raise subprocess.CalledProcessError(res.code, cmd, output=res.out, stderr=res.err)
+    return res.code, res.out, res.err
+
+
+def detect_tools(jobs: int = 1) -> Dict[str, str]:
+    checks = {
+        "forge": ["forge", "--version"],
+        "cast": ["cast", "--version"],
+        "solc": ["solc", "--version"],
+        "slither": ["slither", "--version"],
+    }
+    results = run_parallel({name: (lambda args=args: run(args, kind="version")) for name, args in checks.items()},
+                           EXEC["cancel"], max_workers=jobs)
+    return {name: (out or err).strip() if code == 0 else "absent" for name, (code, out, err) in results.items()}
 
 
 def ensure_build() -> Tuple[bool, str]:
-    code, out, err = run(["bash", "-lc", "forge clean && forge build"], check=False)
+    code, out, err = run(["bash", "-lc", "forge clean && forge build"], check=False, kind="build", log_name="build")
     success = code == 0
     return success, (out + "\n" + err)
 
 
 def maybe_run_gas() -> Optional[str]:
-    code, out, err = run(["bash", "-lc", "forge test -vv --gas-report"], check=False)
+    code, out, err = run(["bash", "-lc", "forge test -vv --gas-report"], check=False, kind="gas", log_name="gas-report")
     return (out + "\n" + err) if code == 0 else None
 
 
 def run_slither_json(tmp_path: Path) -> Optional[Dict[str, Any]]:
     if shutil.which("slither") is None:
         return None
-    code, out, err = run(["bash", "-lc", f"slither . --json {tmp_path}"], check=False)
+    code, out, err = run(["bash", "-lc", f"slither . --json {tmp_path}"], check=False, kind="slither", log_name="slither")
     if code != 0:
         return None
     try:
@@ -102,7 +146,8 @@ def find_contract_path(contract: str) -> Optional[Path]:
 
 
 def forge_inspect(contract: str, what: str) -> Optional[Any]:
-    code, out, err = run(["forge", "inspect", contract, what])
+    # JSON output must stay whole, so inspect output is not ring-buffered
+    code, out, err = run(["forge", "inspect", contract, what], kind="inspect", bounded=False)
     if code != 0:
         return None
     try:
@@ -340,17 +385,33 @@ def list_tests_and_domains() -> Tuple[List[str], List[str], int]:
     return files, domains, test_count
 
 
-def parse_envs_from_scripts() -> List[Tuple[str, str]]:
-    envs: Dict[str, str] = {}
-    for f in glob(str(SCRIPT_DIR / "**/*.s.sol"), recursive=True):
-        try:
-            txt = Path(f).read_text()
-        except Exception:
-            continue
-        for m in re.finditer(r"env(Addr(?:ess)?|Uint|Int|String|Bytes32|Bool)?\(\"([A-Z0-9_]+)\"\)", txt):
-            name = m.group(2)
-            envs[name] = f
-    return sorted([(k, v) for k, v in envs.items()])
+ENV_READ_RE = re.compile(r"\benv(Or|Addr(?:ess)?|Uint|Int|String|Bytes32|Bool|Exists)?\(\s*\"([A-Z0-9_]+)\"")
+
+
+def scan_script_envs(path: Path) -> Dict[str, bool]:
+    """Return env var -> required for one script; envOr/envExists reads are optional."""
+    envs: Dict[str, bool] = {}
+    try:
+        txt = path.read_text()
+    except Exception:
+        return envs
+    for m in ENV_READ_RE.finditer(txt):
+        required = m.group(1) not in ("Or", "Exists")
+        envs[m.group(2)] = envs.get(m.group(2), False) or required
+    return envs
+
+
+def build_env_index() -> Dict[str, Dict[str, bool]]:
+    """Map script path -> {env var: required} for every deploy script."""
+    return {f: scan_script_envs(Path(f)) for f in sorted(glob(str(SCRIPT_DIR / "**/*.s.sol"), recursive=True))}
+
+
+def parse_envs_from_scripts() -> List[Tuple[str, List[str]]]:
+    envs: Dict[str, List[str]] = {}
+    for f, names in build_env_index().items():
+        for name in names:
+            envs.setdefault(name, []).append(f)
+    return sorted(envs.items())
 
 
 def generate_docs(tools: Dict[str, str], contracts_info: Dict[str, Dict[str, Any]], storage_diffs: Dict[str, str], router_fee:
@@ -482,7 +543,7 @@ def generate_docs(tools: Dict[str, str], contracts_info: Dict[str, Dict[str, Any
     lines.append("- Scripts: Phase-1, Phase-1.5, Phase-2, Policy, PPS, Gateway")
     lines.append("- Env vars:")
     for name, used_in in parse_envs_from_scripts():
-        lines.append(f"  - {name} | used in {os.path.relpath(used_in, ROOT)}")
+        lines.append(f"  - {name} | used in {', '.join(os.path.relpath(f, ROOT) for f in used_in)}")
     lines.append("")
 
     lines.append("## Cross-Repo Parity (optional)")
@@ -578,12 +639,44 @@ def write_file(path: Path, content: str):
     path.write_text(content)
 
 
+def timeout_arg(item: str) -> Tuple[str, Optional[float]]:
+    """argparse type for --timeout KIND=SECONDS; SECONDS <= 0 or "none" disables the timeout."""
+    kind, _, secs = item.partition("=")
+    if kind not in TIMEOUTS or not secs:
+        raise argparse.ArgumentTypeError(f"expected KIND=SECONDS with KIND in {sorted(TIMEOUTS)}; got {item!r}")
+    if secs.lower() == "none":
+        return kind, None
+    try:
+        value = float(secs)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"SECONDS must be a number or 'none'; got {item!r}")
+    if not math.isfinite(value):
+        raise argparse.ArgumentTypeError(f"SECONDS must be finite; got {item!r}")
+    return kind, (value if value > 0 else None)
+
+
 def main():
     parser = argparse.ArgumentParser(description="Generate dev status docs for ZPX-LP-Vaults")
     parser.add_argument("--gas", action="store_true", help="Run forge test with gas report")
+    parser.add_argument("--deadline", type=float, default=None, help="Global wall-clock budget in seconds for all commands")
+    parser.add_argument("--timeout", action="append", default=[], type=timeout_arg, metavar="KIND=SECONDS",
+                        help=f"Per-command timeout override (kinds: {', '.join(TIMEOUTS)}; <= 0 or none disables)")
+    parser.add_argument("--log-dir", default=None, help="Tee full output of build/gas/slither runs to this directory")
+    parser.add_argument("--ring-lines", type=int, default=DEFAULT_RING_LINES, help="Lines of output kept in memory per stream")
+    parser.add_argument("--stream", action="store_true", help="Echo build/gas/slither output live to stderr")
+    parser.add_argument("--jobs", type=int, default=1,
+                        help="Parallel forge inspect/version jobs (inspection stays serial if the build failed)")
     args = parser.parse_args()
 
-    tools = detect_tools()
+    TIMEOUTS.update(args.timeout)
+    EXEC["deadline"] = Deadline(args.deadline)
+    EXEC["log_dir"] = Path(args.log_dir).resolve() if args.log_dir else None
+    EXEC["ring_lines"] = max(1, args.ring_lines)
+    EXEC["echo"] = args.stream
+    # SIGINT/SIGTERM cancel running commands; the remaining steps are skipped quickly
+    cancel_on_signals(EXEC["cancel"])
+
+    tools = detect_tools(args.jobs)
 
     # Build
     build_ok, build_out = ensure_build()
@@ -592,12 +685,18 @@ def main():
 
     # Contracts
     contracts = list(CONTRACT_CANDIDATES.keys())
-    contracts_info: Dict[str, Dict[str, Any]] = {}
-    for c in contracts:
+    def safe_collect(c: str) -> Dict[str, Any]:
         try:
-            contracts_info[c] = collect_contract_info(c)
+            return collect_contract_info(c)
         except Exception:
-            contracts_info[c] = {"name": c}
+            return {"name": c}
+
+    # Without a good build each forge inspect recompiles into the shared out/ and cache/
+    inspect_jobs = args.jobs if build_ok else 1
+    progress("inspect", f"collecting {len(contracts)} contracts with {inspect_jobs} jobs")
+    contracts_info: Dict[str, Dict[str, Any]] = run_parallel(
+        {c: (lambda c=c: safe_collect(c)) for c in contracts}, EXEC["cancel"], max_workers=inspect_jobs
+    )
 
     # Storage snapshots compare
     storage_diffs = compare_storage_snapshots(contracts)
@@ -633,6 +732,13 @@ def main():
         except Exception:
             pass
 
+    # A timed-out or cancelled run has partial data; keep the tracked docs as they are
+    if EXEC["incidents"]:
+        print(f"{len(EXEC['incidents'])} command(s) hit a timeout or were cancelled; docs NOT written:", file=sys.stderr)
+        for line in EXEC["incidents"][:20]:
+            print(f" - {line}", file=sys.stderr)
+        sys.exit(2)
+
     # Generate docs
     dev_status_md, checklist_md = generate_docs(
         tools, contracts_info, storage_diffs, router_fee, factory_info, msg_info, gp_info, pause_info, oracle_info, test_files, test_domains, test_count, build_out, slither_summary, gas_out